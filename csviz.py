@@ -3,21 +3,43 @@
 
 import sys
 import os
+import re
 import argparse
 import hashlib
+import functools
+import itertools
 import logging
 import logging.handlers
+import threading
+import concurrent.futures
 from abc import ABCMeta, abstractmethod
 from enum import Enum, auto
-from flask import abort, Response
+from flask import abort, send_from_directory
 
+import numpy
+import pandas
+import waitress
 import dash
 import dash_html_components as html
 import dash_core_components as doc
-import plotly.graph_objs as go
 from dash.dependencies import Input, Output
 
 
+UNSAFE_FILENAME = re.compile(r"\.\.|[/\\]")
+GRAPH_STYLE = dict(marginTop= "18px",
+                   marginLeft="auto",
+                   marginRight="auto")
+LOADING_LOCKS = [threading.Lock() for _ in range(16)]
+GRAPH_LOADER = concurrent.futures.ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+
+
+def max_points_type(value):
+
+    points = int(value)
+    if points < 3:
+        raise argparse.ArgumentTypeError("must be at least 3 to keep both end points")
+    return points
+
 
 def setup_command_line_argument_parser():
 
@@ -37,6 +59,8 @@ def setup_command_line_argument_parser():
     argparser.add_argument("--log", type=str, default=None, help="log file name")
     argparser.add_argument("--cssdir", type=str, default=None, help="css directory")
     argparser.add_argument("--limit", type=int, default=None, help="limit for loading rows")
+    argparser.add_argument("--maxpoints", type=max_points_type, default=None, help="downsample series longer than this")
+    argparser.add_argument("--nowebgl", action="store_true", help="draw lines and scatter with svg instead of webgl")
 
     return argparser.parse_args()
 
@@ -62,6 +86,10 @@ def setup_logging(log_file_path):
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     LOGGER = logger
 
     return 
@@ -107,8 +135,13 @@ class CSVFileLoader(DataLoader):
     Y2_INDICATES = "%"
     PLACE_HOLDER = "_"
     HEADER_COMMENT = "#"
+    HEADER_PATTERN = re.compile(re.escape(HEADER_COMMENT) + r".*\S")
     RANGESLIDER = "rangeslider"
     SUBCOMMAND_SEP = ":"
+    HEADER_LINES = 5
+    TYPE_PROBE_ROWS = 100
+    NUMBER_HEADS = "+-."
+    FLOAT_MARKERS = frozenset(".eE")
     GRAPH_TYPES_CONVERTER = {"lines"  : GraphTypes.Lines,
                              "bar"    : GraphTypes.Bar,
                              "scatter": GraphTypes.Scatter}
@@ -122,28 +155,31 @@ class CSVFileLoader(DataLoader):
     def __csv_header_check(self, headers):
 
         for line in headers:
+            if self.HEADER_PATTERN.match(line):
+                continue
             if not line:
                 LOGGER.warn("empty line found while header")
-                return False
-            if line[0] != self.HEADER_COMMENT:
-                LOGGER.warn("assumed comment character for header does not exist \"%s\"" %str(line[0]))
-                return False
-            if len(line.strip()) == 1:
+            elif line[0] != self.HEADER_COMMENT:
+                LOGGER.warn("assumed comment character for header does not exist \"%s\"", line[0])
+            else:
                 LOGGER.warn("too short hedaer line")
-                return False
+            return False
 
         return True
 
     def __numstr_to_num(self, numstr):
 
+        text = str(numstr).strip()
+
+        if not text or not (text[0].isdigit() or text[0] in self.NUMBER_HEADS):
+            return text
+
         try:
-            int_val = int(numstr)
-            float_val = float(numstr)
-            if "." in numstr:
-                return float_val
-            return int_val
-        except:
-            return str(numstr)
+            if self.FLOAT_MARKERS.intersection(text):
+                return float(text)
+            return int(text)
+        except ValueError:
+            return text
 
     def __parse_graph_types(self, graph_types):
 
@@ -156,7 +192,7 @@ class CSVFileLoader(DataLoader):
             if typ == self.PLACE_HOLDER:
                 continue
             if not typ in self.GRAPH_TYPES_CONVERTER:
-                LOGGER.warn("unrecognized graph type \"%s\"" %str(typ))
+                LOGGER.warn("unrecognized graph type \"%s\"", typ)
                 return
 
         return (tmp if len(tmp) == 1 else tmp[1:])
@@ -165,14 +201,21 @@ class CSVFileLoader(DataLoader):
 
         column_title_row = []
 
-        for each in column_name[1:].split(self.delimiter):
+        for index, each in enumerate(column_name[1:].split(self.delimiter)):
             clean = each.strip()
 
             if clean == self.Y2_INDICATES:
-                LOGGER.warn("invalid column title \"%s\"" %str(clean))
+                LOGGER.warn("invalid column title \"%s\"", clean)
                 return
 
-            column_title_row.append((clean.startswith(self.Y2_INDICATES), clean))
+            # the first entry names the x column, which never goes to the y2 axis
+            if index > 0 and clean.startswith(self.Y2_INDICATES):
+                if len(self.datum.yaxis_title) == 1:
+                    LOGGER.warn("y2 title must be specified")
+                    return
+                column_title_row.append(("y2", clean[len(self.Y2_INDICATES):]))
+            else:
+                column_title_row.append(("y1", clean))
 
         if len(self.datum.graph_types) > 1 and len(column_title_row) != len(self.datum.graph_types) + 1:
             LOGGER.warn("unmatch length for graph types and column titles")
@@ -202,9 +245,35 @@ class CSVFileLoader(DataLoader):
     def setup_load(self):
         pass
 
-    def load(self):
+    def __has_short_rows(self, fields):
+
+        # the parser pads short rows, which then look like an empty last field, so count the fields by hand
+        with open(self.filepath, "r") as handle:
+            rows = [st for st in (line.strip() for line in itertools.islice(handle, self.HEADER_LINES, None)) if st]
+
+        if not self.limit is None:
+            rows = rows[max(0, len(rows) - self.limit):]
+
+        return any(row.count(self.delimiter) + 1 != fields for row in rows)
+
+    def __to_column(self, series):
+
+        if series.dtype != object:
+            return series.values
+
+        values = series.values
+        probe = [self.__numstr_to_num(each) for each in values[:self.TYPE_PROBE_ROWS]]
+
+        if all(isinstance(each, str) for each in probe):
+            stripped = series.str.strip()
+            # blank cells coerce to NaN, so only cells that really parse as numbers force per-cell conversion
+            numbers  = pandas.to_numeric(stripped.iloc[self.TYPE_PROBE_ROWS:], errors="coerce")
+            if not numbers.notnull().any():
+                return stripped.values
+
+        return probe + [self.__numstr_to_num(each) for each in values[self.TYPE_PROBE_ROWS:]]
 
-        num_lines = sum(1 for line in open(self.filepath, "r")) - 1 - 5
+    def load(self):
 
         with open(self.filepath, "r") as handle:
 
@@ -214,61 +283,76 @@ class CSVFileLoader(DataLoader):
             graph_types = handle.readline().strip()
             column_name = handle.readline().strip()
 
-            if not self.__csv_header_check([
-                title,
-                xaxis_title,
-                yaxis_title,
-                graph_types,
-                column_name]): return
-
-            self.datum.graph_title = title[1:].strip()
-            self.datum.xaxis_slider, self.datum.xaxis_title = self.__parse_xaxis_title(xaxis_title[1:].strip())
-            self.datum.yaxis_title = [x.strip() for x in yaxis_title[1:].strip().split(self.delimiter)]
-            self.datum.column_title = self.__parse_column_title(column_name)
-            graph_types_pre_obj = self.__parse_graph_types(graph_types)
-
-            if graph_types_pre_obj is None:
-                return
+        if not self.__csv_header_check([
+            title,
+            xaxis_title,
+            yaxis_title,
+            graph_types,
+            column_name]): return
 
-            if self.datum.column_title is None:
-                return
+        self.datum.graph_title = title[1:].strip()
+        self.datum.xaxis_slider, self.datum.xaxis_title = self.__parse_xaxis_title(xaxis_title[1:].strip())
+        self.datum.yaxis_title = [x.strip() for x in yaxis_title[1:].strip().split(self.delimiter)]
+        self.datum.column_title = self.__parse_column_title(column_name)
+        graph_types_pre_obj = self.__parse_graph_types(graph_types)
 
-            if len(graph_types_pre_obj) < len(self.datum.column_title):
-                specific_type = graph_types_pre_obj[0]
-                larger = len(self.datum.column_title)
-                smaller = len(graph_types_pre_obj)
-                graph_types_pre_obj.extend([specific_type] * (larger - smaller))
-            elif len(graph_types_pre_obj) > len(self.datum.column_title):
-                return
+        if graph_types_pre_obj is None:
+            return
 
-            self.datum.graph_types = [self.GRAPH_TYPES_CONVERTER[each] for each in graph_types_pre_obj]
+        if self.datum.column_title is None:
+            return
 
-            tmp_data = []
-            x = []
+        if len(graph_types_pre_obj) < len(self.datum.column_title):
+            specific_type = graph_types_pre_obj[0]
+            larger = len(self.datum.column_title)
+            smaller = len(graph_types_pre_obj)
+            graph_types_pre_obj.extend([specific_type] * (larger - smaller))
+        elif len(graph_types_pre_obj) > len(self.datum.column_title):
+            return
 
-            for cnt, line in enumerate(handle):
+        self.datum.graph_types = [self.GRAPH_TYPES_CONVERTER[each] for each in graph_types_pre_obj]
 
-                if not self.limit is None:
-                    if cnt <= num_lines - self.limit:
-                        continue
+        if len(self.delimiter) > 1:
+            parser_options = dict(sep=re.escape(self.delimiter), engine="python")
+        else:
+            parser_options = dict(sep=self.delimiter, engine="c", memory_map=True)
 
-                st = line.strip()
-                if st == "":
-                    LOGGER.info("skip loading for empty line")
-                    continue
-                row = st.split(self.delimiter)
+        try:
+            frame = pandas.read_csv(self.filepath,
+                                    skiprows=self.HEADER_LINES,
+                                    header=None,
+                                    skipinitialspace=True,
+                                    skip_blank_lines=True,
+                                    na_filter=False,
+                                    **parser_options)
+        except pandas.errors.ParserError as ex:
+            LOGGER.warn("unmatch length for data row and column titles")
+            LOGGER.warn("%s", ex)
+            return
+        except pandas.errors.EmptyDataError:
+            LOGGER.warn("no data rows found")
+            self.datum.x_data = []
+            self.datum.column_datum = [[] for _ in self.datum.column_title]
+            return self.datum
+
+        if frame.shape[1] != len(self.datum.column_title) + 1:
+            LOGGER.warn("unmatch length for data row and column titles")
+            return
 
-                if len(row) != len(self.datum.column_title) + 1:
-                    return
+        if not self.limit is None:
+            frame = frame.tail(self.limit)
 
-                numrow = list(map(self.__numstr_to_num, row))
-                tmp_data.append(numrow)
-                x.append(numrow[0])
+        last_column = frame.iloc[:, -1]
+        maybe_short = last_column.isnull().any() or \
+                      (last_column.dtype == object and (last_column.str.strip() == "").any())
 
-            trans = list(map(list, zip(*tmp_data)))[1:]
+        if maybe_short and self.__has_short_rows(frame.shape[1]):
+            LOGGER.warn("unmatch length for data row and column titles")
+            return
 
-            self.datum.x_data = x
-            self.datum.column_datum = trans
+        self.datum.x_data = self.__to_column(frame.iloc[:, 0])
+        self.datum.column_datum = [self.__to_column(frame.iloc[:, i])
+                                   for i in range(1, frame.shape[1])]
 
         return self.datum
 
@@ -276,17 +360,75 @@ class CSVFileLoader(DataLoader):
 class GraphMaker(object):
 
     TraceMaker = {GraphTypes.Lines   : (lambda title, x, y, axis:
-                                        go.Scatter(x=x, y=y, mode="lines", name=title, yaxis=axis)),\
+                                        dict(x=x, y=y, mode="lines", name=title, yaxis=axis)),\
                   GraphTypes.Bar     : (lambda title, x, y, axis:
-                                        go.Bar(x=x, y=y, name=title, yaxis=axis)),\
+                                        dict(x=x, y=y, name=title, yaxis=axis)),\
                   GraphTypes.Scatter : (lambda title, x, y, axis:
-                                        go.Scatter(x=x, y=y, mode="markers", name=title, yaxis=axis))}
+                                        dict(x=x, y=y, mode="markers", name=title, yaxis=axis))}
 
-    def __init__(self, datum, font_size, bgcolor):
+    WebGLTraceType = {GraphTypes.Lines   : "scattergl",
+                      GraphTypes.Bar     : "bar",
+                      GraphTypes.Scatter : "scattergl"}
+
+    SVGTraceType = {GraphTypes.Lines   : "scatter",
+                    GraphTypes.Bar     : "bar",
+                    GraphTypes.Scatter : "scatter"}
+
+    def __init__(self, datum, font_size, bgcolor, max_points=None, webgl=True):
 
         self.datum = datum
         self.font_size = font_size
         self.bgcolor = bgcolor
+        self.max_points = max_points
+        trace_types = self.WebGLTraceType if webgl else self.SVGTraceType
+        self.trace_specs = [(self.TraceMaker[graph_type], trace_types[graph_type], column_title, axis)
+                            for graph_type, (axis, column_title) in zip(datum.graph_types,
+                                                                       datum.column_title)]
+        self.base_layout = dict(paper_bgcolor=bgcolor,
+                                plot_bgcolor=bgcolor,
+                                font=dict(size=font_size),
+                                legend=dict(orientation = "h", 
+                                            font = dict(size = int(0.85 * font_size)),
+                                            yanchor="top",
+                                            x=0,
+                                            y=1.1))
+
+    def __downsample(self, column_data):
+
+        # largest-triangle-three-buckets over the row index, so that non numeric x axes work as well
+        size = len(column_data)
+        threshold = self.max_points
+        edges = numpy.linspace(1, size - 1, threshold - 1).astype(int)
+        selected = numpy.empty(threshold, dtype=int)
+        selected[0] = anchor = 0
+        selected[-1] = size - 1
+
+        for i in range(threshold - 2):
+            start, end = edges[i], edges[i + 1]
+            next_end = edges[i + 2] if i + 2 < len(edges) else size
+            next_x = (end + next_end - 1) / 2.0
+            next_y = column_data[end:next_end].mean()
+            area = numpy.abs((anchor - next_x) * (column_data[start:end] - column_data[anchor]) -
+                             (anchor - numpy.arange(start, end)) * (next_y - column_data[anchor]))
+            anchor = start + int(area.argmax())
+            selected[i + 1] = anchor
+
+        return selected
+
+    def __reduce_points(self, x_data, column_data):
+
+        if self.max_points is None or len(column_data) <= self.max_points:
+            return x_data, column_data
+
+        if not isinstance(column_data, numpy.ndarray) or column_data.dtype.kind not in "iuf":
+            return x_data, column_data
+
+        selected = self.__downsample(column_data)
+
+        if isinstance(x_data, numpy.ndarray):
+            return x_data[selected], column_data[selected]
+
+        return [x_data[i] for i in selected], column_data[selected]
 
     def make_graph(self):
 
@@ -295,21 +437,9 @@ class GraphMaker(object):
 
         traces = []
 
-        for graph_type, (y2flag, column_title), column_data in zip(self.datum.graph_types,
-                                                                   self.datum.column_title,
-                                                                   self.datum.column_datum):
-            if y2flag:
-                if len(self.datum.yaxis_title) == 1:
-                    LOGGER.warn("y2 title must be specified")
-                    return
-                axis = "y2"
-                column_title = column_title[1:]
-            else:
-                axis = "y1"
-
-            trace_maker = self.TraceMaker[graph_type]
-            trace = trace_maker(column_title, self.datum.x_data, column_data, axis)
-            traces.append(trace)
+        for (trace_maker, trace_type, column_title, axis), column_data in zip(self.trace_specs, self.datum.column_datum):
+            x_data, column_data = self.__reduce_points(self.datum.x_data, column_data)
+            traces.append(dict(trace_maker(column_title, x_data, column_data, axis), type=trace_type))
 
         if len(self.datum.yaxis_title) == 1:
             yaxis2 = dict()
@@ -318,36 +448,67 @@ class GraphMaker(object):
 
         figure = dict(
             data = traces,
-            layout = go.Layout(title=self.datum.graph_title,
-                                xaxis=({"title": self.datum.xaxis_title} if not self.datum.xaxis_slider else
-                                       {"title": self.datum.xaxis_title, "rangeslider":{}}),
-                                yaxis=dict(title = self.datum.yaxis_title[0]),
-                                yaxis2=yaxis2,
-                                paper_bgcolor=self.bgcolor,
-                                plot_bgcolor=self.bgcolor,
-                                font=dict(size=self.font_size),
-                                legend=dict(orientation = "h", 
-                                            font = dict(size = int(0.85 * self.font_size)),
-                                            yanchor="top",
-                                            x=0,
-                                            y=1.1)))
+            layout = dict(self.base_layout,
+                          title=self.datum.graph_title,
+                          xaxis=({"title": self.datum.xaxis_title} if not self.datum.xaxis_slider else
+                                 {"title": self.datum.xaxis_title, "rangeslider":{}}),
+                          yaxis=dict(title = self.datum.yaxis_title[0]),
+                          yaxis2=yaxis2))
         return figure
 
 
-def make_dropdown_menu(path):
-    
+@functools.lru_cache(maxsize=8)
+def scan_directory(path, mtime_ns):
+
+    with os.scandir(path) as entries:
+        files = sorted(entry.name for entry in entries
+                       if entry.is_file() and not entry.name.startswith("."))
+
+    return [dict(label = fname, value = fname) for fname in files]
+
+
+def check_data_directory(path):
+
     if not os.path.isdir(path):
-        LOGGER.critical("csv data directory %s does not exist" %path)
+        LOGGER.critical("csv data directory %s does not exist", path)
         sys.exit(1)
 
-    files = sorted(os.listdir(path))
-    con = [dict(label = fname, value = fname) for fname in files if not fname.startswith(".")]
-
-    if not con:
-        LOGGER.critical("directory %s does not contain any files" %path)
+    if not make_dropdown_menu(path):
+        LOGGER.critical("directory %s does not contain any files", path)
         sys.exit(1)
 
-    return con
+
+def make_dropdown_menu(path):
+    
+    try:
+        return scan_directory(path, os.stat(path).st_mtime_ns)
+    except OSError as ex:
+        LOGGER.error("unable to list csv data directory %s", path)
+        LOGGER.error("%s", ex)
+        return []
+
+
+@functools.lru_cache(maxsize=64)
+def load_graph_datum(filepath, delimiter, limit, mtime_ns, size):
+
+    # mtime_ns and size are only part of the cache key, so that a modified file is parsed again
+    loader = CSVFileLoader(filepath, delimiter, limit)
+    loader.setup_load()
+    return loader.load()
+
+
+@functools.lru_cache(maxsize=64)
+def make_graph_figure(filepath, delimiter, limit, mtime_ns, size, font_size, bgcolor, max_points, webgl):
+
+    # keyed like load_graph_datum rather than on the datum object, so that this cache does not keep old data alive
+    datum = load_graph_datum(filepath, delimiter, limit, mtime_ns, size)
+    return GraphMaker(datum, font_size, bgcolor, max_points, webgl).make_graph()
+
+
+@functools.lru_cache(maxsize=1024)
+def make_graph_id(fname):
+
+    return "graph-" + hashlib.blake2b(fname.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def make_graph_wrapper(args, fname, listup=0):
@@ -360,33 +521,39 @@ def make_graph_wrapper(args, fname, listup=0):
         graph_height = args.height
 
     try:
-        loader = CSVFileLoader(os.path.join(args.directory, fname), args.delimiter, args.limit)
-        loader.setup_load()
-        datum  = loader.load()
+        filepath = os.path.join(args.directory, fname)
+        with LOADING_LOCKS[hash(filepath) % len(LOADING_LOCKS)]:
+            stat = os.stat(filepath)
+            datum = load_graph_datum(filepath, args.delimiter, args.limit, stat.st_mtime_ns, stat.st_size)
     except Exception as ex:
-        LOGGER.error("exception occurred while loading data for \"%s\"" %fname)
-        LOGGER.error("%s" %str(ex))
+        LOGGER.error("exception occurred while loading data for \"%s\"", fname)
+        LOGGER.error("%s", ex)
         return 
 
     if datum is None:
-        LOGGER.warn("unable to load data for \"%s\"" %fname)
+        LOGGER.warn("unable to load data for \"%s\"", fname)
         return
 
     try:
-        graph = GraphMaker(datum, args.fontsize, "#" + args.bgcolor)
-        graph_obj = doc.Graph(id=hashlib.md5(fname.encode("utf-8")).hexdigest(),
-                              figure=graph.make_graph(),
-                              style=dict(height = graph_height, 
-                                         width=graph_width, 
-                                         marginTop= "18px",
-                                         marginLeft="auto",
-                                         marginRight="auto"),
+        graph_obj = doc.Graph(id=make_graph_id(fname),
+                              figure=make_graph_figure(filepath,
+                                                       args.delimiter,
+                                                       args.limit,
+                                                       stat.st_mtime_ns,
+                                                       stat.st_size,
+                                                       args.fontsize,
+                                                       "#" + args.bgcolor,
+                                                       args.maxpoints,
+                                                       not args.nowebgl and listup == 0),
+                              style=dict(GRAPH_STYLE,
+                                         height = graph_height, 
+                                         width=graph_width),
                               config=dict(displayModeBar=args.showtoolbar))
         return graph_obj
 
     except Exception as ex:
-        LOGGER.error("exception occurred while rendering graph for \"%s\"" %fname)
-        LOGGER.error("%s" %str(ex))
+        LOGGER.error("exception occurred while rendering graph for \"%s\"", fname)
+        LOGGER.error("%s", ex)
         return
 
 
@@ -398,7 +565,7 @@ def add_local_css_to_app(cssdir):
         return
 
     if not os.path.isdir(cssdir):
-        LOGGER.critical("csv data directory %s does not exist" %cssdir)
+        LOGGER.critical("csv data directory %s does not exist", cssdir)
         sys.exit(1)
 
     tmp = os.listdir(cssdir)
@@ -444,7 +611,7 @@ def make_top_page(args, pager):
             doc.Dropdown(
                 id="graph_selection",
                 options=menu,
-                value=[menu[0]["value"]],
+                value=([menu[0]["value"]] if menu else []),
                 multi=True),
             html.Button("reload list", id="update-menu")
             ],style=dict(width=args.width, 
@@ -471,10 +638,10 @@ def listup_graphs(args):
     result = []
     width_graph_group = []
 
-    for each in files:
+    fnames = [each["value"] for each in files]
+    graphs = GRAPH_LOADER.map(functools.partial(make_graph_wrapper, args, listup=width_tiling), fnames)
 
-        fname = each["value"]
-        graph = make_graph_wrapper(args, fname, listup=width_tiling)
+    for graph in graphs:
 
         graph_section = html.Div(graph, style=dict(width='%spx' %int(args.width/width_tiling),
                                                    display='inline-block',
@@ -536,34 +703,46 @@ if __name__ == "__main__":
     args = setup_command_line_argument_parser()
 
     setup_logging(args.log)
+    check_data_directory(args.directory)
+
+    if not args.cssdir is None:
+        args.cssdir = os.path.abspath(args.cssdir)
 
     application = dash.Dash()
     application.title = args.apptitle
     application.css.config.serve_locally = args.offline
     application.scripts.config.serve_locally = args.offline
 
-    application.layout = html.Div([
-        doc.Location(id="url", refresh=False, pathname="/"),
-        html.Div([
-            make_top_page(args,pager)
-        ],id="page-content")])
+    def serve_layout():
+
+        return html.Div([
+            doc.Location(id="url", refresh=False, pathname="/"),
+            html.Div([
+                make_top_page(args,pager)
+            ],id="page-content")])
+
+    application.layout = serve_layout
 
     @application.callback(
         Output("graphs", "children"),
         [Input("graph_selection", "value")])
     def update_graph(value):
 
-        graphs = []
+        fnames = []
 
         for each in reversed(value):
 
-            LOGGER.info("loading for \"%s\"" %each)
+            LOGGER.info("loading for \"%s\"", each)
 
-            if (not each) or (".." in each) or ("/" in each):
-                LOGGER.warn("invalid character \"%s\"" %each)
+            if (not each) or UNSAFE_FILENAME.search(each):
+                LOGGER.warn("invalid character \"%s\"", each)
                 continue
 
-            graph_obj = make_graph_wrapper(args, each)
+            fnames.append(each)
+
+        graphs = []
+
+        for graph_obj in GRAPH_LOADER.map(functools.partial(make_graph_wrapper, args), fnames):
 
             if graph_obj is None:
                 continue
@@ -577,10 +756,10 @@ if __name__ == "__main__":
         Output("page-content", "children"),
         [Input("url", "pathname")])
     def make_page(pathname):
-        LOGGER.info("requested page \"%s\"" %pathname)
+        LOGGER.info("requested page \"%s\"", pathname)
 
         if not pathname in pager:
-            LOGGER.warn("requested page \"%s\" does not exists" %str(pathname))
+            LOGGER.warn("requested page \"%s\" does not exists", pathname)
             return
 
         title, maker = pager[pathname]
@@ -597,19 +776,25 @@ if __name__ == "__main__":
     @application.server.route("/css/<stylesheet>")
     def serve_stylesheet(stylesheet):
 
-        LOGGER.info("requested css file name \"%s\"" %str(stylesheet))
+        LOGGER.info("requested css file name \"%s\"", stylesheet)
 
-        if (".." in stylesheet) or ("/" in stylesheet):
-            LOGGER.warn("invalid file name \"%s\"" %str(stylesheet))
+        if UNSAFE_FILENAME.search(stylesheet):
+            LOGGER.warn("invalid file name \"%s\"", stylesheet)
             abort(404)
 
         try:
-            with open(os.path.join(args.cssdir, stylesheet), "r") as handle:
-                return Response(handle.read(), mimetype="text/css")
+            return send_from_directory(args.cssdir,
+                                       stylesheet,
+                                       mimetype="text/css",
+                                       conditional=True,
+                                       cache_timeout=3600)
 
         except Exception as ex:
-            LOGGER.warn("exception occurred while loading css file \"%s\"" %str(stylesheet))
+            LOGGER.warn("exception occurred while loading css file \"%s\"", stylesheet)
             abort(404)
 
-    application.run_server(debug=args.debug, host=args.addr, port=args.port)
+    if args.debug:
+        application.run_server(debug=True, host=args.addr, port=args.port, threaded=True)
+    else:
+        waitress.serve(application.server, host=args.addr, port=args.port, threads=8)
 